@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import shutil
@@ -5,7 +6,7 @@ from datetime import datetime
 
 import uvicorn
 from cryptography.fernet import Fernet
-from dotenv import find_dotenv, load_dotenv, set_key
+from dotenv import dotenv_values, find_dotenv, load_dotenv, set_key
 from fasthtml.common import *
 
 from local_cortex.memory import (
@@ -60,6 +61,31 @@ def reload_env():
     logger.info("♻️ Environment variables reloaded")
 
 
+def _find_env_path():
+    """Locate the .env file, creating it from .env.example when missing."""
+    env_path = find_dotenv()
+    if not env_path:
+        env_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env"
+        )
+        # Create .env from .env.example if it doesn't exist
+        env_example_path = env_path + ".example"
+        if os.path.exists(env_example_path) and not os.path.exists(env_path):
+            shutil.copy(env_example_path, env_path)
+    return env_path
+
+
+def _set_env_if_changed(env_path, current_values, key, value):
+    """Write a key to the .env file if provided and different from the stored value.
+
+    Returns True when the file was written.
+    """
+    if not value or value == current_values.get(key):
+        return False
+    set_key(env_path, key, value)
+    return True
+
+
 def get_security_warnings():
     """Get list of security warnings for display."""
     warnings = []
@@ -123,7 +149,7 @@ async def health(req):
         return JSONResponse({"error": "Unauthorized", "status": "error"}, status_code=401)
 
     try:
-        stats = get_memory_stats()
+        stats = await asyncio.to_thread(get_memory_stats)
         warnings = get_security_warnings()
 
         return {
@@ -149,7 +175,7 @@ async def db_check():
     - 500: Unexpected error during check
     """
     try:
-        db_status = check_database_connection()
+        db_status = await asyncio.to_thread(check_database_connection)
 
         # Determine appropriate HTTP status code
         if db_status["connected"]:
@@ -183,6 +209,12 @@ async def db_check():
         )
 
 
+async def recall_and_think(user_input, context_limit):
+    """Recupera la memoria a corto plazo y genera la respuesta con ese contexto."""
+    context = await asyncio.to_thread(get_last_thoughts, context_limit)
+    return await asyncio.to_thread(brain.think, user_input, context)
+
+
 @rt("/api/synapse", methods=["POST"])
 async def synapse(req):
     """Endpoint principal que recibe datos de tu web."""
@@ -201,11 +233,16 @@ async def synapse(req):
         # Get context limit from environment
         context_limit = int(os.getenv("MEMORY_CONTEXT_LIMIT", "5"))
 
-        # Recuperar memoria a corto plazo
-        context = get_last_thoughts(context_limit)
-
-        # Pensar y clasificar
-        classification = brain.fast_classify(user_input)
+        # Clasificar mientras se recupera la memoria y se piensa la respuesta
+        think_task = asyncio.create_task(recall_and_think(user_input, context_limit))
+        try:
+            classification = await asyncio.to_thread(brain.fast_classify, user_input)
+        except BaseException:
+            # Sin clasificación no hay respuesta: si think aún no arrancó ya no lo
+            # hará; si ya corre en su hilo, termina en segundo plano y se descarta.
+            think_task.cancel()
+            raise
+        response_text = await think_task
         intent = (
             classification["intent"]
             if isinstance(classification, dict)
@@ -217,10 +254,8 @@ async def synapse(req):
             else 0.8
         )
 
-        response_text = brain.think(user_input, context)
-
         # Guardar en memoria
-        save_thought(user_input, response_text, intent)
+        await asyncio.to_thread(save_thought, user_input, response_text, intent)
 
         # Responder a la web
         return {
@@ -249,7 +284,7 @@ async def memory_search(req):
         if not query:
             return {"error": "Query parameter 'q' is required", "status": "error"}
 
-        results = search_thoughts(query, limit)
+        results = await asyncio.to_thread(search_thoughts, query, limit)
         return {
             "status": "success",
             "query": query,
@@ -269,7 +304,7 @@ async def memory_stats(req):
         return JSONResponse({"error": "Unauthorized", "status": "error"}, status_code=401)
 
     try:
-        stats = get_memory_stats()
+        stats = await asyncio.to_thread(get_memory_stats)
         return {"status": "success", "stats": stats}
     except Exception as e:
         logger.error(f"Error retrieving stats: {e}")
@@ -287,7 +322,7 @@ async def memory_cleanup(req):
         form = await req.form()
         days = int(form.get("days", os.getenv("MEMORY_ARCHIVE_DAYS", "30")))
 
-        deleted_count = cleanup_old_thoughts(days)
+        deleted_count = await asyncio.to_thread(cleanup_old_thoughts, days)
         return {
             "status": "success",
             "deleted_count": deleted_count,
@@ -308,7 +343,7 @@ async def memory_by_intent(intent: str, req):
     try:
         # Make limit configurable via query parameter
         limit = int(req.query_params.get("limit", "10"))
-        results = get_thoughts_by_intent(intent.upper(), limit)
+        results = await asyncio.to_thread(get_thoughts_by_intent, intent.upper(), limit)
         return {
             "status": "success",
             "intent": intent.upper(),
@@ -448,33 +483,15 @@ async def save_credenciales(req):
     try:
         form = await req.form()
 
-        # Find or create .env file
-        env_path = find_dotenv()
-        if not env_path:
-            env_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".env"
-            )
-            # Create .env from .env.example if it doesn't exist
-            env_example_path = env_path + ".example"
-            if os.path.exists(env_example_path) and not os.path.exists(env_path):
-                shutil.copy(env_example_path, env_path)
-
-        updated_keys = []
-
-        # Update AMA_SHARED_SECRET if provided
+        env_path = _find_env_path()
         ama_secret = form.get("ama_shared_secret", "").strip()
-        if ama_secret:
-            set_key(env_path, "AMA_SHARED_SECRET", ama_secret)
-            updated_keys.append("AMA_SHARED_SECRET")
-
-        # Update FERNET_KEY if provided
         fernet_key = form.get("fernet_key", "").strip()
+        ollama_model = form.get("ollama_model", "").strip()
+
         if fernet_key:
             # Validate Fernet key format
             try:
                 Fernet(fernet_key.encode())
-                set_key(env_path, "FERNET_KEY", fernet_key)
-                updated_keys.append("FERNET_KEY")
             except Exception as e:
                 logger.warning(f"Invalid Fernet key provided: {e}")
                 return Titled(
@@ -496,29 +513,41 @@ async def save_credenciales(req):
                     ),
                 )
 
-        # Update OLLAMA_MODEL if provided
-        ollama_model = form.get("ollama_model", "").strip()
-        if ollama_model:
-            set_key(env_path, "OLLAMA_MODEL", ollama_model)
-            updated_keys.append("OLLAMA_MODEL")
+        # Current .env values, so unchanged keys don't rewrite the file
+        current_values = dotenv_values(env_path)
+        updated_keys = []
+        for key, value in (
+            ("AMA_SHARED_SECRET", ama_secret),
+            ("FERNET_KEY", fernet_key),
+            ("OLLAMA_MODEL", ollama_model),
+        ):
+            if _set_env_if_changed(env_path, current_values, key, value):
+                updated_keys.append(key)
 
         # Hot reload environment variables
         reload_env()
 
-        logger.info(f"✅ Credentials updated: {', '.join(updated_keys)}")
+        if updated_keys:
+            logger.info(f"✅ Credentials updated: {', '.join(updated_keys)}")
+            title = "✅ Credenciales Actualizadas"
+            heading = "✅ Cambios Guardados"
+            summary = f"Las siguientes claves han sido actualizadas: {', '.join(updated_keys)}"
+            detail = (
+                "Los cambios se han aplicado inmediatamente sin reiniciar el servidor."
+            )
+        else:
+            logger.info("ℹ️ Credentials unchanged: submitted values already stored")
+            title = "ℹ️ Credenciales Sin Cambios"
+            heading = "ℹ️ Sin Cambios"
+            summary = "Sin cambios: los valores enviados ya estaban guardados."
+            detail = "Las variables de entorno se han recargado desde .env."
 
         return Titled(
-            "✅ Credenciales Actualizadas",
+            title,
             Div(
-                H1("✅ Cambios Guardados"),
-                P(
-                    f"Las siguientes claves han sido actualizadas: {', '.join(updated_keys)}",
-                    style="color: #059669; font-weight: bold;",
-                ),
-                P(
-                    "Los cambios se han aplicado inmediatamente sin reiniciar el servidor.",
-                    style="color: #6b7280; margin-top: 10px;",
-                ),
+                H1(heading),
+                P(summary, style="color: #059669; font-weight: bold;"),
+                P(detail, style="color: #6b7280; margin-top: 10px;"),
                 P(
                     A("← Volver al panel", href="/credenciales"),
                     " | ",
@@ -644,7 +673,8 @@ def admin():
         return Titled("Error", P(f"Error: {str(e)}"))
 
 
-if __name__ == "__main__":
+def main():
+    """Run the bridge with uvicorn using environment configuration."""
     # Get configuration from environment variables with secure defaults
     host = os.getenv("HOST", "127.0.0.1")  # Default to localhost for security
     port = int(os.getenv("PORT", "5001"))
@@ -653,3 +683,7 @@ if __name__ == "__main__":
     )  # Default to false for production
 
     uvicorn.run("bridge.server:app", host=host, port=port, reload=reload)
+
+
+if __name__ == "__main__":
+    main()
@@ -123,20 +123,18 @@ def get_memory_stats() -> Dict[str, Any]:
     """Get statistics about the memory database."""
     with get_db_connection() as conn:
         c = conn.cursor()
-        c.execute("SELECT COUNT(*) FROM interactions")
-        total_count = c.fetchone()[0]
+        # Both queries are answered from covering indexes (idx_timestamp, idx_intent)
+        c.execute("SELECT COUNT(*), MIN(timestamp), MAX(timestamp) FROM interactions")
+        total_count, first_interaction, last_interaction = c.fetchone()
 
         c.execute("SELECT intent, COUNT(*) FROM interactions GROUP BY intent")
         by_intent = dict(c.fetchall())
 
-        c.execute("SELECT MIN(timestamp), MAX(timestamp) FROM interactions")
-        date_range = c.fetchone()
-
     return {
         "total_interactions": total_count,
         "by_intent": by_intent,
-        "first_interaction": date_range[0],
-        "last_interaction": date_range[1],
+        "first_interaction": first_interaction,
+        "last_interaction": last_interaction,
     }
 
 
@@ -146,13 +144,8 @@ def cleanup_old_thoughts(days: int = 30) -> int:
 
     with get_db_connection() as conn:
         c = conn.cursor()
-        c.execute(
-            "SELECT COUNT(*) FROM interactions WHERE timestamp < ?", (cutoff_date,)
-        )
-        count = c.fetchone()[0]
-
-        if count > 0:
-            c.execute("DELETE FROM interactions WHERE timestamp < ?", (cutoff_date,))
+        c.execute("DELETE FROM interactions WHERE timestamp < ?", (cutoff_date,))
+        count = c.rowcount
     return count
 
 
@@ -1,5 +1,7 @@
 import logging
 import os
+import threading
+from collections import OrderedDict
 
 import ollama
 
@@ -8,6 +10,9 @@ log_level = os.getenv("LOG_LEVEL", "INFO")
 logging.basicConfig(level=getattr(logging, log_level), format="%(message)s")
 logger = logging.getLogger(__name__)
 
+# Valid intent labels returned by fast_classify
+INTENT_LABELS = ("CODIGO", "CHAT", "ANALISIS")
+
 
 class LocalBrain:
     def __init__(self, model=None):
@@ -18,6 +23,11 @@ class LocalBrain:
         Responde de forma técnica, precisa y sin relleno.
         Si te piden código, da solo el código.
         """
+        # Caché LRU de clasificaciones: conserva la primera etiqueta válida obtenida
+        # para cada texto (el modelo muestrea, así que otra llamada podría diferir)
+        self.classify_cache_size = int(os.getenv("CLASSIFY_CACHE_SIZE", "256"))
+        self._classify_cache = OrderedDict()
+        self._classify_lock = threading.Lock()
 
     def think(self, user_input, context=""):
         """Procesa el input del usuario usando el modelo local."""
@@ -36,6 +46,12 @@ class LocalBrain:
 
     def fast_classify(self, text):
         """Decide qué tipo de tarea es sin gastar mucha energía."""
+        with self._classify_lock:
+            cached = self._classify_cache.get(text)
+            if cached is not None:
+                self._classify_cache.move_to_end(text)
+                return dict(cached)
+
         res = ollama.generate(
             model=self.model,
             prompt=f"Clasifica en una palabra [CODIGO, CHAT, ANALISIS]: {text}",
@@ -46,4 +62,13 @@ class LocalBrain:
         confidence = 0.8  # Default confidence
 
         # Return structured classification
-        return {"intent": classification, "confidence": confidence}
+        result = {"intent": classification, "confidence": confidence}
+
+        # Only well-formed labels are cached; anything else is retried next time
+        if self.classify_cache_size > 0 and classification in INTENT_LABELS:
+            with self._classify_lock:
+                self._classify_cache[text] = result
+                if len(self._classify_cache) > self.classify_cache_size:
+                    self._classify_cache.popitem(last=False)
+
+        return dict(result)
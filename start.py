@@ -7,14 +7,20 @@ def main():
     print("🧠 Iniciando Protocolo AMA-Intent v3...")
 
     # Verificar que existe la carpeta data
-    if not os.path.exists("data"):
+    try:
         os.makedirs("data")
         print("📁 Carpeta de memoria creada.")
+    except FileExistsError:
+        pass
 
     # Verificar Ollama (solución pragmática)
     try:
+        # Solo importa el código de salida: descartar la salida sin bufferizarla
         result = subprocess.run(
-            ["ollama", "list"], capture_output=True, text=True, check=False
+            ["ollama", "list"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
         )
         if result.returncode != 0:
             print("❌ ERROR: Ollama no parece estar instalado o corriendo.")
@@ -28,7 +34,10 @@ def main():
     # Lanzar puente
     print("🚀 Levantando el puente neuronal en puerto 5001...")
     try:
-        subprocess.run([sys.executable, "-m", "bridge.server"], check=True)
+        # En el mismo proceso: uvicorn reutiliza el módulo ya importado
+        from bridge.server import main as run_server
+
+        run_server()
     except KeyboardInterrupt:
         print("\n✅ Sistema detenido correctamente.")
     except Exception as e:
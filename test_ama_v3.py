@@ -13,6 +13,8 @@ import tempfile
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+SEPARATOR = "=" * 70
+
 
 class TestAMAv3:
     """Test suite for AMA-Intent v3"""
@@ -48,6 +50,10 @@ class TestAMAv3:
 
             memory.DB_PATH = self.original_db_path
 
+    def print_banner(self, title):
+        """Print a title framed by separator lines"""
+        print(f"{SEPARATOR}\n{title}\n{SEPARATOR}")
+
     def run_test(self, test_name, test_func):
         """Run a single test"""
         try:
@@ -179,7 +185,7 @@ class TestAMAv3:
 
     def test_memory_cleanup(self):
         """Test cleaning up old memories"""
-        from local_cortex.memory import cleanup_old_thoughts, init_db
+        from local_cortex.memory import DB_PATH, cleanup_old_thoughts, init_db
 
         init_db()
 
@@ -187,6 +193,18 @@ class TestAMAv3:
         deleted = cleanup_old_thoughts(days=365)
         assert isinstance(deleted, int), "Cleanup should return integer count"
 
+        # Insert an entry older than the cutoff and verify it is counted
+        conn = sqlite3.connect(DB_PATH)
+        conn.execute(
+            "INSERT INTO interactions (timestamp, input, output, intent) VALUES (?, ?, ?, ?)",
+            ("2000-01-01T00:00:00", "Old input", "Old output", "CHAT"),
+        )
+        conn.commit()
+        conn.close()
+
+        deleted = cleanup_old_thoughts(days=365)
+        assert deleted == 1, f"Expected 1 old thought removed, got {deleted}"
+
         print(f"   ✓ Cleanup completed, {deleted} thoughts removed")
 
     def test_memory_by_intent(self):
@@ -206,6 +224,152 @@ class TestAMAv3:
 
         print(f"   ✓ Found {len(codigo_thoughts)} thoughts with CODIGO intent")
 
+    def test_classify_cache(self):
+        """Test that repeated classifications reuse the cached result"""
+        try:
+            from local_cortex import thought
+        except ImportError as e:
+            print(f"   ⚠️ Skipped, requires external dependency: {e}")
+            return
+
+        calls = []
+        responses = {"Hola AMA": "chat", "Texto raro": "Chat."}
+
+        def fake_generate(model, prompt):
+            calls.append(prompt)
+            return {"response": responses[prompt.rsplit(": ", 1)[1]]}
+
+        original_generate = thought.ollama.generate
+        thought.ollama.generate = fake_generate
+        try:
+            brain = thought.LocalBrain(model="test-model")
+            first = brain.fast_classify("Hola AMA")
+            second = brain.fast_classify("Hola AMA")
+            brain.fast_classify("Texto raro")
+            brain.fast_classify("Texto raro")
+        finally:
+            thought.ollama.generate = original_generate
+
+        assert first == {"intent": "CHAT", "confidence": 0.8}, f"Unexpected: {first}"
+        assert second == first, "Cached classification differs from original"
+        assert len(calls) == 3, f"Expected 3 model calls, got {len(calls)}"
+
+        print("   ✓ Valid labels served from cache, malformed labels retried")
+
+    def test_synapse_endpoint(self):
+        """Test the synapse endpoint with a stubbed brain"""
+        try:
+            from starlette.testclient import TestClient
+
+            from bridge import server
+        except ImportError as e:
+            print(f"   ⚠️ Skipped, requires external dependency: {e}")
+            return
+
+        from local_cortex.memory import (
+            get_thoughts_by_intent,
+            save_thought,
+            search_thoughts,
+        )
+
+        class StubBrain:
+            def __init__(self, fail_classify=False):
+                self.fail_classify = fail_classify
+                self.think_calls = []
+
+            def fast_classify(self, text):
+                if self.fail_classify:
+                    raise RuntimeError("Classifier unavailable")
+                return {"intent": "SYNAPSE_TEST", "confidence": 0.9}
+
+            def think(self, user_input, context=""):
+                self.think_calls.append((user_input, context))
+                return f"Respuesta a {user_input}"
+
+        original_brain = server.brain
+        original_secret = os.environ.get("AMA_SHARED_SECRET")
+        os.environ["AMA_SHARED_SECRET"] = "synapse-test-secret"
+        headers = {"X-AMA-Secret": "synapse-test-secret"}
+        client = TestClient(server.app)
+        try:
+            save_thought("Synapse context marker", "Previous answer", "CHAT")
+            stub = StubBrain()
+            server.brain = stub
+            data = client.post(
+                "/api/synapse", data={"input": "Synapse question"}, headers=headers
+            ).json()
+            assert data["status"] == "success", f"Unexpected response: {data}"
+            assert data["intent"] == "SYNAPSE_TEST", f"Wrong intent: {data}"
+            assert data["response"] == "Respuesta a Synapse question"
+
+            # Recalled memory reaches think() and the classified intent is stored
+            assert len(stub.think_calls) == 1, "think() should run exactly once"
+            assert (
+                "Synapse context marker" in stub.think_calls[0][1]
+            ), "Recent memory was not passed to think() as context"
+            saved = get_thoughts_by_intent("SYNAPSE_TEST")
+            assert [r["input"] for r in saved] == [
+                "Synapse question"
+            ], f"Thought not saved with classified intent: {saved}"
+
+            # A failed classification must not produce or store a response
+            server.brain = StubBrain(fail_classify=True)
+            data = client.post(
+                "/api/synapse", data={"input": "Failing question"}, headers=headers
+            ).json()
+            assert data["status"] == "error", f"Expected error, got: {data}"
+            assert not search_thoughts("Failing question"), "Failed request was saved"
+        finally:
+            server.brain = original_brain
+            if original_secret is None:
+                os.environ.pop("AMA_SHARED_SECRET", None)
+            else:
+                os.environ["AMA_SHARED_SECRET"] = original_secret
+
+        print("   ✓ Synapse used recalled context, stored intent, rejected failures")
+
+    def test_credentials_skip_unchanged(self):
+        """Test that saving unchanged credentials leaves .env untouched"""
+        try:
+            from dotenv import dotenv_values
+            from starlette.testclient import TestClient
+
+            from bridge import server
+        except ImportError as e:
+            print(f"   ⚠️ Skipped, requires external dependency: {e}")
+            return
+
+        env_path = os.path.join(self.test_dir, ".env")
+        original_content = "OLLAMA_MODEL=llama3.1\nAMA_SHARED_SECRET=abc123\n"
+        with open(env_path, "w") as f:
+            f.write(original_content)
+
+        original_find_dotenv = server.find_dotenv
+        server.find_dotenv = lambda: env_path
+        client = TestClient(server.app)
+        try:
+            # Same values: nothing is rewritten and the page says so
+            page = client.post(
+                "/api/credenciales/save",
+                data={"ollama_model": "llama3.1", "ama_shared_secret": "abc123"},
+            ).text
+            with open(env_path) as f:
+                assert f.read() == original_content, ".env rewritten without changes"
+            assert "Sin cambios" in page, "Unchanged submit not reported"
+
+            # A changed value is written and listed
+            page = client.post(
+                "/api/credenciales/save", data={"ollama_model": "qwen2.5"}
+            ).text
+            values = dotenv_values(env_path)
+            assert values["OLLAMA_MODEL"] == "qwen2.5", f"Model not saved: {values}"
+            assert values["AMA_SHARED_SECRET"] == "abc123", "Secret was altered"
+            assert "OLLAMA_MODEL" in page, "Updated key not listed"
+        finally:
+            server.find_dotenv = original_find_dotenv
+
+        print("   ✓ Unchanged credentials skipped, changed ones written")
+
     def test_module_imports(self):
         """Test that all modules can be imported"""
         modules = [
@@ -279,9 +443,7 @@ class TestAMAv3:
 
     def run_all_tests(self):
         """Run all tests"""
-        print("=" * 70)
-        print("🧪 AMA-Intent v3 Test Suite")
-        print("=" * 70)
+        self.print_banner("🧪 AMA-Intent v3 Test Suite")
 
         self.setup()
 
@@ -300,14 +462,18 @@ class TestAMAv3:
             self.run_test("Memory Statistics", self.test_memory_stats)
             self.run_test("Memory Cleanup", self.test_memory_cleanup)
             self.run_test("Memory Filter by Intent", self.test_memory_by_intent)
+            self.run_test("Classification Cache", self.test_classify_cache)
+            self.run_test("Synapse Endpoint", self.test_synapse_endpoint)
+            self.run_test(
+                "Credentials Skip Unchanged", self.test_credentials_skip_unchanged
+            )
 
         finally:
             self.teardown()
 
         # Print summary
-        print("\n" + "=" * 70)
-        print("📊 TEST SUMMARY")
-        print("=" * 70)
+        print()
+        self.print_banner("📊 TEST SUMMARY")
         print(f"✅ Tests Passed: {self.tests_passed}")
         print(f"❌ Tests Failed: {self.tests_failed}")
         print(